@@ -1,22 +1,188 @@
 import json
 import os
-import sqlite3
+import queue
 import time
+from collections import namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
 
-from flask import Flask, jsonify, request
+import orjson
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    # pysqlite3-binary bundles a current SQLite instead of the one the OS ships
+    from pysqlite3 import dbapi2 as sqlite3
+except ImportError:
+    import sqlite3
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; always compact and without key sorting"""
+
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+app.json = OrjsonProvider(app)
+
+# Frontend dev and preview servers by default; set CORS_ORIGINS (comma-separated) for deployments
+CORS_ORIGINS = os.environ.get(
+    "CORS_ORIGINS",
+    "http://localhost:8080,http://127.0.0.1:8080,"
+    "http://localhost:3000,http://127.0.0.1:3000,"
+    "http://localhost:4173,http://127.0.0.1:4173",  # 4173: vite preview (npm run preview)
+).split(",")
+CORS(
+    app,
+    resources={r"/api/*": {"origins": CORS_ORIGINS}},
+    methods=["GET", "POST", "PUT", "DELETE"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
+)
 
 # Database configuration
 DATABASE_PATH = "plants.db"
+MIN_SQLITE_VERSION = (3, 35, 0)  # First release with RETURNING
+MAX_PLANT_ID = 2**31 - 1  # Out-of-range IDs are rejected before touching the pool
+POOL_SIZE = 8  # Connections kept open and shared between request threads
+STATEMENT_CACHE_SIZE = 256  # Prepared statements cached per connection
+POOL_TIMEOUT = 5  # Seconds to wait for a free connection before answering 503
+
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_database()
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA cache_size=-65536",  # 64MB page cache
+    "PRAGMA foreign_keys=ON",
+)
+
+REQUIRED_FIELDS = frozenset({"name", "axiom", "rules", "iterations", "angle"})
+
+# (column, API key) for every plant field, in response order. The single source for both
+# the SELECT aliases and the keys to_api() assigns, so the two can't drift apart
+PLANT_FIELDS = (
+    ("id", "id"),
+    ("name", "name"),
+    ("timestamp", "timestamp"),
+    ("axiom", "axiom"),
+    ("rules", "rules"),
+    ("iterations", "iterations"),
+    ("angle", "angle"),
+    ("angle_variation", "angleVariation"),
+    ("length_variation", "lengthVariation"),
+    ("length_tapering", "lengthTapering"),
+    ("leaf_probability", "leafProbability"),
+    ("leaf_generation_threshold", "leafGenerationThreshold"),
+    ("length", "length"),
+    ("thickness", "thickness"),
+    ("tapering", "tapering"),
+)
+PLANT_KEYS = tuple(key for _, key in PLANT_FIELDS)
+
+# Columns aliased to their API keys, so rows map directly to responses
+SELECT_COLUMNS = ", ".join(
+    column if column == key else f"{column} AS {key}" for column, key in PLANT_FIELDS
+)
+
+# SQL is kept in module constants so every call passes the identical string and hits the
+# connection's prepared statement cache
+PLANT_COLUMNS = """
+    name, timestamp, axiom, rules, iterations, angle,
+    angle_variation, length_variation, length_tapering,
+    leaf_probability, leaf_generation_threshold,
+    length, thickness, tapering
+"""
+
+SQL_SELECT_ALL = f"SELECT {SELECT_COLUMNS} FROM plants ORDER BY timestamp DESC, id DESC"
+# An ID match wins over a plant whose name happens to look like that ID
+SQL_SELECT_BY_ID_OR_NAME = f"""
+    SELECT {SELECT_COLUMNS} FROM plants
+    WHERE id = ? OR name = ?
+    ORDER BY id = ? DESC
+    LIMIT 1
+"""
+SQL_LAST_INSERT_ROWID = "SELECT last_insert_rowid()"
+SQL_SELECT_EXISTING_NAMES = (
+    "SELECT name FROM plants WHERE name IN (SELECT value FROM json_each(?))"
+)
+
+# Saving under an existing name overwrites that plant
+SQL_UPSERT_PLANT = f"""
+    INSERT INTO plants ({PLANT_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        timestamp = excluded.timestamp,
+        axiom = excluded.axiom,
+        rules = excluded.rules,
+        iterations = excluded.iterations,
+        angle = excluded.angle,
+        angle_variation = excluded.angle_variation,
+        length_variation = excluded.length_variation,
+        length_tapering = excluded.length_tapering,
+        leaf_probability = excluded.leaf_probability,
+        leaf_generation_threshold = excluded.leaf_generation_threshold,
+        length = excluded.length,
+        thickness = excluded.thickness,
+        tapering = excluded.tapering
+    RETURNING {SELECT_COLUMNS}
+"""
+SQL_INSERT_OR_IGNORE_PLANT = f"""
+    INSERT OR IGNORE INTO plants ({PLANT_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_UPDATE_BY_ID = f"""
+    UPDATE plants SET
+        name = COALESCE(?, name),
+        timestamp = ?,
+        axiom = COALESCE(?, axiom),
+        rules = COALESCE(?, rules),
+        iterations = COALESCE(?, iterations),
+        angle = COALESCE(?, angle),
+        angle_variation = COALESCE(?, angle_variation),
+        length_variation = COALESCE(?, length_variation),
+        length_tapering = COALESCE(?, length_tapering),
+        leaf_probability = COALESCE(?, leaf_probability),
+        leaf_generation_threshold = COALESCE(?, leaf_generation_threshold),
+        length = COALESCE(?, length),
+        thickness = COALESCE(?, thickness),
+        tapering = COALESCE(?, tapering)
+    WHERE id = ?
+    RETURNING {SELECT_COLUMNS}
+"""
+
+SQL_DELETE_BY_ID = "DELETE FROM plants WHERE id = ? RETURNING name"
+SQL_DELETE_BY_NAME = "DELETE FROM plants WHERE name = ? RETURNING name"
+
+
+def configure_connection(conn):
+    """Apply the per-connection PRAGMAs"""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
 
 
 def init_database():
     """Initialize the SQLite database with plants table"""
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} is too old, "
+            f"{'.'.join(map(str, MIN_SQLITE_VERSION))}+ is required "
+            "(pip install pysqlite3-binary)"
+        )
+
     with sqlite3.connect(DATABASE_PATH) as conn:
+        # WAL lets readers continue while a write commits and avoids an fsync per commit
+        conn.execute("PRAGMA journal_mode=WAL")
+        configure_connection(conn)
         conn.execute("""
             CREATE TABLE IF NOT EXISTS plants (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -37,316 +203,217 @@ def init_database():
                 UNIQUE(name)
             )
         """)
+        # Walked in order by get_plants so the list needs no sort step; id breaks timestamp
+        # ties. UNIQUE(name) already indexes name lookups.
+        conn.execute("DROP INDEX IF EXISTS idx_plants_timestamp")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_plants_ts_desc ON plants(timestamp DESC, id DESC)"
+        )
         conn.commit()
 
 
+@lru_cache(maxsize=32)
+def row_class(description):
+    """Build the namedtuple type for a result layout (cached per cursor.description)"""
+    return namedtuple("Row", [column[0] for column in description], rename=True)
+
+
+def namedtuple_factory(cursor, row):
+    """Row factory producing namedtuples without rebuilding the row type each time"""
+    return row_class(cursor.description)(*row)
+
+
+def create_connection():
+    """Open a database connection configured for use from the pool"""
+    conn = sqlite3.connect(
+        DATABASE_PATH, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = namedtuple_factory  # Enable column access by name
+    configure_connection(conn)
+    return conn
+
+
+def init_pool():
+    """Fill the connection pool with ready-to-use connections"""
+    pool = queue.Queue(maxsize=POOL_SIZE)
+    for _ in range(POOL_SIZE):
+        pool.put(create_connection())
+    return pool
+
+
+class PoolExhaustedError(Exception):
+    """No pooled connection became free within POOL_TIMEOUT"""
+
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
+    """Context manager that borrows a connection from the pool"""
+    # Streamed lists hold their connection until the client has read the whole body, so
+    # slow clients can tie up the pool; don't let other requests queue behind them forever
+    try:
+        conn = _POOL.get(timeout=POOL_TIMEOUT)
+    except queue.Empty:
+        raise PoolExhaustedError("Database busy, try again later") from None
     try:
         yield conn
     finally:
-        conn.close()
+        # Never hand a connection with a half-finished transaction to the next request
+        if conn.in_transaction:
+            conn.rollback()
+        _POOL.put(conn)
 
 
-@app.route("/api/plants", methods=["GET"])
-def get_plants():
-    """Get all plant configurations"""
+def error_response(e):
+    """JSON error response for a failed request: 503 if the pool is exhausted, else 500"""
+    status = 503 if isinstance(e, PoolExhaustedError) else 500
+    return jsonify({"error": str(e)}), status
+
+
+def get_json_body():
+    """Parse the request body with orjson, or return None if it is empty or invalid"""
     try:
-        with get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM plants ORDER BY timestamp DESC
-            """)
-            plants = cursor.fetchall()
-
-            result = []
-            for plant in plants:
-                result.append(
-                    {
-                        "id": plant["id"],
-                        "name": plant["name"],
-                        "timestamp": plant["timestamp"],
-                        "axiom": plant["axiom"],
-                        "rules": plant["rules"],
-                        "iterations": plant["iterations"],
-                        "angle": plant["angle"],
-                        "angleVariation": plant["angle_variation"],
-                        "lengthVariation": plant["length_variation"],
-                        "lengthTapering": plant["length_tapering"],
-                        "leafProbability": plant["leaf_probability"],
-                        "leafGenerationThreshold": plant["leaf_generation_threshold"],
-                        "length": plant["length"],
-                        "thickness": plant["thickness"],
-                        "tapering": plant["tapering"],
-                    }
-                )
-
-            return jsonify(result)
+        return orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
 
+def to_api(plant):
+    """Convert a plant row selected with SELECT_COLUMNS into its API representation"""
+    return dict(zip(PLANT_KEYS, plant))
 
-@app.route("/api/plants/<int:plant_id>", methods=["GET"])
-def get_plant(plant_id):
-    """Get a specific plant configuration by ID"""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT * FROM plants WHERE id = ?
-            """,
-                (plant_id,),
-            )
-            plant = cursor.fetchone()
 
-            if not plant:
-                return jsonify({"error": "Plant not found"}), 404
+def plant_params(data, timestamp, threshold_key="leafGenerationThreshold"):
+    """Build the INSERT parameters for a plant, filling in optional field defaults
 
-            result = {
-                "id": plant["id"],
-                "name": plant["name"],
-                "timestamp": plant["timestamp"],
-                "axiom": plant["axiom"],
-                "rules": plant["rules"],
-                "iterations": plant["iterations"],
-                "angle": plant["angle"],
-                "angleVariation": plant["angle_variation"],
-                "lengthVariation": plant["length_variation"],
-                "lengthTapering": plant["length_tapering"],
-                "leafProbability": plant["leaf_probability"],
-                "leafGenerationThreshold": plant["leaf_generation_threshold"],
-                "length": plant["length"],
-                "thickness": plant["thickness"],
-                "tapering": plant["tapering"],
-            }
+    localStorage exports name the leaf threshold "leafThreshold", hence threshold_key.
+    """
+    get = data.get
+    return (
+        data["name"],
+        timestamp,
+        data["axiom"],
+        data["rules"],
+        data["iterations"],
+        data["angle"],
+        get("angleVariation", 0),
+        get("lengthVariation", 0),
+        get("lengthTapering", 1.0),
+        get("leafProbability", 0),
+        get(threshold_key, 0),
+        get("length", 1.0),
+        get("thickness", 0.1),
+        get("tapering", 0.8),
+    )
+
+
+# Initialize on import so every server process (not only `python app.py`) gets a ready database
+init_database()
+_POOL = init_pool()
+
+
+@app.before_request
+def set_request_timestamp():
+    """Read the clock once per request; handlers and migrations reuse g.ts_ms"""
+    g.ts_ms = int(time.time() * 1000)  # Milliseconds timestamp
 
-            return jsonify(result)
 
+@app.route("/api/plants", methods=["GET"])
+def get_plants():
+    """Get all plant configurations, streamed row by row as a JSON array"""
+
+    def generate():
+        with get_db_connection() as conn:
+            cursor = conn.execute(SQL_SELECT_ALL)
+            yield  # Query is running; the response body starts with the next chunk
+
+            yield "["
+            first = True
+            for plant in cursor:
+                if not first:
+                    yield ","
+                first = False
+                yield orjson.dumps(to_api(plant))
+            yield "]"
+
+    try:
+        chunks = generate()
+        next(chunks)  # Run the query before streaming so errors get a proper status
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
+
+    return Response(stream_with_context(chunks), mimetype="application/json")
 
 
-@app.route("/api/plants/<name>", methods=["GET"])
-def get_plant_by_name(name):
-    """Get a specific plant configuration by name"""
+@app.route("/api/plants/<plant_key>", methods=["GET"])
+def get_plant(plant_key):
+    """Get a specific plant configuration by ID or name"""
     try:
+        plant_id = -1  # Not a plain in-range number, so only the name can match
+        if plant_key.isascii() and plant_key.isdigit():
+            if 0 < int(plant_key) <= MAX_PLANT_ID:
+                plant_id = int(plant_key)
+
         with get_db_connection() as conn:
             cursor = conn.execute(
-                """
-                SELECT * FROM plants WHERE name = ?
-            """,
-                (name,),
+                SQL_SELECT_BY_ID_OR_NAME, (plant_id, plant_key, plant_id)
             )
             plant = cursor.fetchone()
 
             if not plant:
                 return jsonify({"error": "Plant not found"}), 404
 
-            result = {
-                "id": plant["id"],
-                "name": plant["name"],
-                "timestamp": plant["timestamp"],
-                "axiom": plant["axiom"],
-                "rules": plant["rules"],
-                "iterations": plant["iterations"],
-                "angle": plant["angle"],
-                "angleVariation": plant["angle_variation"],
-                "lengthVariation": plant["length_variation"],
-                "lengthTapering": plant["length_tapering"],
-                "leafProbability": plant["leaf_probability"],
-                "leafGenerationThreshold": plant["leaf_generation_threshold"],
-                "length": plant["length"],
-                "thickness": plant["thickness"],
-                "tapering": plant["tapering"],
-            }
-
-            return jsonify(result)
+            return jsonify(to_api(plant))
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @app.route("/api/plants", methods=["POST"])
 def create_plant():
     """Create a new plant configuration"""
     try:
-        data = request.get_json()
+        data = get_json_body()
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
 
         # Validate required fields
-        required_fields = ["name", "axiom", "rules", "iterations", "angle"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-
-        # Set default values for optional fields
-        timestamp = int(time.time() * 1000)  # Milliseconds timestamp
+        missing_fields = REQUIRED_FIELDS.difference(data)
+        if missing_fields:
+            missing = ", ".join(sorted(missing_fields))
+            return jsonify({"error": f"Missing required fields: {missing}"}), 400
 
         with get_db_connection() as conn:
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO plants (
-                        name, timestamp, axiom, rules, iterations, angle,
-                        angle_variation, length_variation, length_tapering,
-                        leaf_probability, leaf_generation_threshold,
-                        length, thickness, tapering
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        data["name"],
-                        timestamp,
-                        data["axiom"],
-                        data["rules"],
-                        data["iterations"],
-                        data["angle"],
-                        data.get("angleVariation", 0),
-                        data.get("lengthVariation", 0),
-                        data.get("lengthTapering", 1.0),
-                        data.get("leafProbability", 0),
-                        data.get("leafGenerationThreshold", 0),
-                        data.get("length", 1.0),
-                        data.get("thickness", 0.1),
-                        data.get("tapering", 0.8),
-                    ),
-                )
-                conn.commit()
-
-                # Get the created plant
-                cursor = conn.execute(
-                    """
-                    SELECT * FROM plants WHERE name = ? ORDER BY timestamp DESC LIMIT 1
-                """,
-                    (data["name"],),
-                )
-                plant = cursor.fetchone()
-
-                result = {
-                    "id": plant["id"],
-                    "name": plant["name"],
-                    "timestamp": plant["timestamp"],
-                    "axiom": plant["axiom"],
-                    "rules": plant["rules"],
-                    "iterations": plant["iterations"],
-                    "angle": plant["angle"],
-                    "angleVariation": plant["angle_variation"],
-                    "lengthVariation": plant["length_variation"],
-                    "lengthTapering": plant["length_tapering"],
-                    "leafProbability": plant["leaf_probability"],
-                    "leafGenerationThreshold": plant["leaf_generation_threshold"],
-                    "length": plant["length"],
-                    "thickness": plant["thickness"],
-                    "tapering": plant["tapering"],
-                }
-
-                return jsonify(result), 201
-
-            except sqlite3.IntegrityError:
-                # Plant name already exists, update instead
-                conn.execute(
-                    """
-                    UPDATE plants SET
-                        timestamp = ?, axiom = ?, rules = ?, iterations = ?, angle = ?,
-                        angle_variation = ?, length_variation = ?, length_tapering = ?,
-                        leaf_probability = ?, leaf_generation_threshold = ?,
-                        length = ?, thickness = ?, tapering = ?
-                    WHERE name = ?
-                """,
-                    (
-                        timestamp,
-                        data["axiom"],
-                        data["rules"],
-                        data["iterations"],
-                        data["angle"],
-                        data.get("angleVariation", 0),
-                        data.get("lengthVariation", 0),
-                        data.get("lengthTapering", 1.0),
-                        data.get("leafProbability", 0),
-                        data.get("leafGenerationThreshold", 0),
-                        data.get("length", 1.0),
-                        data.get("thickness", 0.1),
-                        data.get("tapering", 0.8),
-                        data["name"],
-                    ),
-                )
-                conn.commit()
-
-                # Get the updated plant
-                cursor = conn.execute(
-                    """
-                    SELECT * FROM plants WHERE name = ?
-                """,
-                    (data["name"],),
-                )
-                plant = cursor.fetchone()
-
-                result = {
-                    "id": plant["id"],
-                    "name": plant["name"],
-                    "timestamp": plant["timestamp"],
-                    "axiom": plant["axiom"],
-                    "rules": plant["rules"],
-                    "iterations": plant["iterations"],
-                    "angle": plant["angle"],
-                    "angleVariation": plant["angle_variation"],
-                    "lengthVariation": plant["length_variation"],
-                    "lengthTapering": plant["length_tapering"],
-                    "leafProbability": plant["leaf_probability"],
-                    "leafGenerationThreshold": plant["leaf_generation_threshold"],
-                    "length": plant["length"],
-                    "thickness": plant["thickness"],
-                    "tapering": plant["tapering"],
-                }
-
-                return jsonify(result), 200
+            # last_insert_rowid() only changes if the upsert inserted rather than updated
+            last_rowid = conn.execute(SQL_LAST_INSERT_ROWID).fetchone()[0]
+            cursor = conn.execute(SQL_UPSERT_PLANT, plant_params(data, g.ts_ms))
+            plant = cursor.fetchone()  # Created or updated row, via RETURNING
+            conn.commit()
+
+            created = cursor.lastrowid != last_rowid
+            return jsonify(to_api(plant)), 201 if created else 200
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @app.route("/api/plants/<int:plant_id>", methods=["PUT"])
 def update_plant(plant_id):
     """Update an existing plant configuration"""
+    if not 0 < plant_id <= MAX_PLANT_ID:
+        return jsonify({"error": "Invalid plant id"}), 400
+
     try:
-        data = request.get_json()
+        data = get_json_body()
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
 
-        timestamp = int(time.time() * 1000)
-
         with get_db_connection() as conn:
-            # Check if plant exists
-            cursor = conn.execute("SELECT id FROM plants WHERE id = ?", (plant_id,))
-            if not cursor.fetchone():
-                return jsonify({"error": "Plant not found"}), 404
-
-            # Update plant
-            conn.execute(
-                """
-                UPDATE plants SET
-                    name = COALESCE(?, name),
-                    timestamp = ?,
-                    axiom = COALESCE(?, axiom),
-                    rules = COALESCE(?, rules),
-                    iterations = COALESCE(?, iterations),
-                    angle = COALESCE(?, angle),
-                    angle_variation = COALESCE(?, angle_variation),
-                    length_variation = COALESCE(?, length_variation),
-                    length_tapering = COALESCE(?, length_tapering),
-                    leaf_probability = COALESCE(?, leaf_probability),
-                    leaf_generation_threshold = COALESCE(?, leaf_generation_threshold),
-                    length = COALESCE(?, length),
-                    thickness = COALESCE(?, thickness),
-                    tapering = COALESCE(?, tapering)
-                WHERE id = ?
-            """,
+            # Update plant; no returned row means it does not exist
+            cursor = conn.execute(
+                SQL_UPDATE_BY_ID,
                 (
                     data.get("name"),
-                    timestamp,
+                    g.ts_ms,
                     data.get("axiom"),
                     data.get("rules"),
                     data.get("iterations"),
@@ -362,55 +429,35 @@ def update_plant(plant_id):
                     plant_id,
                 ),
             )
+            plant = cursor.fetchone()  # Updated row, via RETURNING
+            if not plant:
+                return jsonify({"error": "Plant not found"}), 404
             conn.commit()
 
-            # Return updated plant
-            cursor = conn.execute("SELECT * FROM plants WHERE id = ?", (plant_id,))
-            plant = cursor.fetchone()
-
-            result = {
-                "id": plant["id"],
-                "name": plant["name"],
-                "timestamp": plant["timestamp"],
-                "axiom": plant["axiom"],
-                "rules": plant["rules"],
-                "iterations": plant["iterations"],
-                "angle": plant["angle"],
-                "angleVariation": plant["angle_variation"],
-                "lengthVariation": plant["length_variation"],
-                "lengthTapering": plant["length_tapering"],
-                "leafProbability": plant["leaf_probability"],
-                "leafGenerationThreshold": plant["leaf_generation_threshold"],
-                "length": plant["length"],
-                "thickness": plant["thickness"],
-                "tapering": plant["tapering"],
-            }
-
-            return jsonify(result)
+            return jsonify(to_api(plant))
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @app.route("/api/plants/<int:plant_id>", methods=["DELETE"])
 def delete_plant(plant_id):
     """Delete a plant configuration"""
+    if not 0 < plant_id <= MAX_PLANT_ID:
+        return jsonify({"error": "Invalid plant id"}), 400
+
     try:
         with get_db_connection() as conn:
-            # Check if plant exists
-            cursor = conn.execute("SELECT name FROM plants WHERE id = ?", (plant_id,))
-            plant = cursor.fetchone()
+            # Delete plant; no returned row means it does not exist
+            plant = conn.execute(SQL_DELETE_BY_ID, (plant_id,)).fetchone()
             if not plant:
                 return jsonify({"error": "Plant not found"}), 404
-
-            # Delete plant
-            conn.execute("DELETE FROM plants WHERE id = ?", (plant_id,))
             conn.commit()
 
-            return jsonify({"message": f'Plant "{plant["name"]}" deleted successfully'})
+            return jsonify({"message": f'Plant "{plant.name}" deleted successfully'})
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @app.route("/api/plants/name/<name>", methods=["DELETE"])
@@ -418,27 +465,23 @@ def delete_plant_by_name(name):
     """Delete a plant configuration by name"""
     try:
         with get_db_connection() as conn:
-            # Check if plant exists
-            cursor = conn.execute("SELECT id FROM plants WHERE name = ?", (name,))
-            plant = cursor.fetchone()
+            # Delete plant; no returned row means it does not exist
+            plant = conn.execute(SQL_DELETE_BY_NAME, (name,)).fetchone()
             if not plant:
                 return jsonify({"error": "Plant not found"}), 404
-
-            # Delete plant
-            conn.execute("DELETE FROM plants WHERE name = ?", (name,))
             conn.commit()
 
             return jsonify({"message": f'Plant "{name}" deleted successfully'})
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @app.route("/api/plants/migrate", methods=["POST"])
 def migrate_from_localstorage():
     """Migrate plant data from localStorage format"""
     try:
-        data = request.get_json()
+        data = get_json_body()
         if not data or "plants" not in data:
             return jsonify({"error": "No plants data provided"}), 400
 
@@ -446,75 +489,41 @@ def migrate_from_localstorage():
         if not isinstance(plants, list):
             return jsonify({"error": "Plants data must be an array"}), 400
 
-        migrated_count = 0
         errors = []
+        rows = []
 
         with get_db_connection() as conn:
+            # Look up all incoming names at once instead of relying on a failing INSERT per duplicate
+            names = [p.get("name") for p in plants if isinstance(p, dict)]
+            cursor = conn.execute(SQL_SELECT_EXISTING_NAMES, (json.dumps(names),))
+            existing = {row.name for row in cursor}
+
             for plant_data in plants:
                 try:
-                    # Map localStorage format to API format
-                    mapped_data = {
-                        "name": plant_data.get("name"),
-                        "axiom": plant_data.get("axiom"),
-                        "rules": plant_data.get("rules"),
-                        "iterations": plant_data.get("iterations"),
-                        "angle": plant_data.get("angle"),
-                        "angleVariation": plant_data.get("angleVariation", 0),
-                        "lengthVariation": plant_data.get("lengthVariation", 0),
-                        "lengthTapering": plant_data.get("lengthTapering", 1.0),
-                        "leafProbability": plant_data.get("leafProbability", 0),
-                        "leafGenerationThreshold": plant_data.get("leafThreshold", 0),
-                        "length": plant_data.get("length", 1.0),
-                        "thickness": plant_data.get("thickness", 0.1),
-                        "tapering": plant_data.get("tapering", 0.8),
-                    }
-
-                    # Validate required fields
-                    required_fields = ["name", "axiom", "rules", "iterations", "angle"]
-                    if not all(
-                        mapped_data.get(field) is not None for field in required_fields
-                    ):
+                    # Validate required fields before doing any mapping work
+                    if any(plant_data.get(field) is None for field in REQUIRED_FIELDS):
                         errors.append(
                             f"Missing required fields in plant: {plant_data.get('name', 'unnamed')}"
                         )
                         continue
 
-                    timestamp = plant_data.get("timestamp", int(time.time() * 1000))
-
-                    try:
-                        conn.execute(
-                            """
-                            INSERT INTO plants (
-                                name, timestamp, axiom, rules, iterations, angle,
-                                angle_variation, length_variation, length_tapering,
-                                leaf_probability, leaf_generation_threshold,
-                                length, thickness, tapering
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                            (
-                                mapped_data["name"],
-                                timestamp,
-                                mapped_data["axiom"],
-                                mapped_data["rules"],
-                                mapped_data["iterations"],
-                                mapped_data["angle"],
-                                mapped_data["angleVariation"],
-                                mapped_data["lengthVariation"],
-                                mapped_data["lengthTapering"],
-                                mapped_data["leafProbability"],
-                                mapped_data["leafGenerationThreshold"],
-                                mapped_data["length"],
-                                mapped_data["thickness"],
-                                mapped_data["tapering"],
-                            ),
-                        )
-                        migrated_count += 1
-                    except sqlite3.IntegrityError:
+                    name = plant_data["name"]
+
+                    # An explicit null timestamp would be dropped silently by OR IGNORE on
+                    # its NOT NULL constraint
+                    timestamp = plant_data.get("timestamp", g.ts_ms)
+                    if timestamp is None:
+                        errors.append(f"Invalid timestamp in plant: {name}")
+                        continue
+
+                    if name in existing:
                         # Plant already exists, skip
-                        errors.append(
-                            f"Plant '{mapped_data['name']}' already exists, skipped"
-                        )
+                        errors.append(f"Plant '{name}' already exists, skipped")
                         continue
+                    existing.add(name)
+
+                    # Map localStorage format straight to a database row
+                    rows.append(plant_params(plant_data, timestamp, "leafThreshold"))
 
                 except Exception as e:
                     errors.append(
@@ -522,7 +531,17 @@ def migrate_from_localstorage():
                     )
                     continue
 
+            # Insert the whole batch in one transaction; OR IGNORE covers rows added concurrently
+            conn.execute("BEGIN IMMEDIATE")
+            changes_before = conn.total_changes
+            conn.executemany(SQL_INSERT_OR_IGNORE_PLANT, rows)
             conn.commit()
+            migrated_count = conn.total_changes - changes_before
+
+        # Rows OR IGNORE dropped, e.g. a numeric name matching a stored text name
+        ignored_count = len(rows) - migrated_count
+        if ignored_count:
+            errors.append(f"{ignored_count} plants already existed, skipped")
 
         return jsonify(
             {
@@ -533,18 +552,17 @@ def migrate_from_localstorage():
         )
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @app.route("/api/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "timestamp": int(time.time() * 1000)})
+    return jsonify({"status": "healthy", "timestamp": g.ts_ms})
 
 
 if __name__ == "__main__":
-    # Initialize database on startup
-    init_database()
     print(f"Database initialized at: {os.path.abspath(DATABASE_PATH)}")
     print("Starting Flask API server on port 5001...")
-    app.run(debug=True, host="0.0.0.0", port=5001)
+    # Development server only; use wsgi.py with Gunicorn for production
+    app.run(debug=False, host="0.0.0.0", port=5001)
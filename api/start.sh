@@ -35,7 +35,7 @@ fi
 
 # Install dependencies if they're not already installed
 echo "📦 Checking dependencies..."
-$PYTHON_CMD -c "import flask, flask_cors" 2>/dev/null
+$PYTHON_CMD -c "import flask, flask_cors, orjson" 2>/dev/null
 if [ $? -ne 0 ]; then
     echo "📥 Installing required dependencies..."
     if command -v pip3 &> /dev/null; then
@@ -49,7 +49,7 @@ if [ $? -ne 0 ]; then
     fi
 
     # Verify installation
-    $PYTHON_CMD -c "import flask, flask_cors" 2>/dev/null
+    $PYTHON_CMD -c "import flask, flask_cors, orjson" 2>/dev/null
     if [ $? -ne 0 ]; then
         echo "❌ Error: Failed to install dependencies"
         exit 1
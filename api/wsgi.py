@@ -0,0 +1,13 @@
+"""
+WSGI entry point for running the API under a production server.
+
+Run from the api directory:
+   gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5001 wsgi:app
+
+Each worker imports app.py on its own and so opens its own connection pool.
+Don't use --preload: SQLite connections must not be shared across fork().
+"""
+
+from app import app
+
+__all__ = ["app"]